@@ -19,10 +19,7 @@ This file contains the network monitoring collector for Multicast S,G health
 check.
 """
 
-from pydantic.dataclasses import dataclass
-from pydantic import conint
-
-from netpaca import Metric
+from netpaca import MetricTimestamp
 from netpaca.collectors import CollectorType, CollectorConfigModel
 from netpaca.config_model import CollectorModel  # noqa
 
@@ -56,14 +53,22 @@ class MCastSGCollectorConfig(CollectorConfigModel):
 # 0 = S,G flow active (has OIF),
 # 1 = S,G flow not active
 # 2 = S,G flow not not available
+#
+# A metric instance is created for each S,G flow on each device for each
+# collection interval.  The values come from the collector status functions
+# rather than user input, so this is a plain slotted class instead of a
+# (validating) pydantic dataclass.
+
 
-_McastSGStatusValue = conint(ge=0, le=2)
+class McastSGStatus(object):
+    __slots__ = ("ts", "value", "tags")
 
+    name = "mcast_sg_status"
 
-@dataclass
-class McastSGStatus(Metric):
-    value: _McastSGStatusValue
-    name: str = "mcast_sg_status"
+    def __init__(self, ts: MetricTimestamp, value: int, tags: dict):
+        self.ts = ts
+        self.value = value
+        self.tags = tags
 
 
 # -----------------------------------------------------------------------------
@@ -46,7 +46,7 @@ Flags:
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Optional, List, Tuple
+from typing import Optional, List
 
 # -----------------------------------------------------------------------------
 # Public Imports
@@ -159,22 +159,7 @@ async def get_mcast_flow_metrics(
         )
         return
 
-    metrics = [
-        mcast_sg.McastSGStatus(
-            ts=timestamp,
-            value=_mcast_sg_status(mcast_flow=flow_data),
-            tags={
-                "S": mcast_S,
-                "G": mcast_G,
-                "flags": flow_data["routeFlags"],
-                "rpf_if_name": flow_data["rpfInterface"],
-                "oif_list": ",".join(flow_data["oifList"]),
-            },
-        )
-        for mcast_S, mcast_G, flow_data in _find_mcast_sg_flows(cli_sh_ip_mroute.output)
-    ]
-
-    return metrics
+    return _collect_metrics(cli_sh_ip_mroute.output, timestamp)
 
 
 # -----------------------------------------------------------------------------
@@ -185,34 +170,58 @@ async def get_mcast_flow_metrics(
 
 
 def _mcast_sg_status(mcast_flow):
-    flags = mcast_flow["routeFlags"]
+    # only the first route flag is used to determine the status
+    flag = mcast_flow["routeFlags"][:1]
 
-    if flags.startswith("S"):
+    if flag == "S":
         return 0 if mcast_flow["oifList"] else 1
 
-    if flags.startswith("J"):
-        return 2
+    return 2 if flag == "J" else 1
 
-    return 1
 
-
-def _find_mcast_sg_flows(cli_data) -> Tuple[str, str, dict]:
+def _collect_metrics(cli_data, ts) -> List[Metric]:
     """
-    This generator will yield a tuple of S,G,data for each multicast.
+    This function returns the list of S,G status metrics for each multicast
+    flow, excluding the (*,G) entries.  The flows are walked inline, rather
+    than by a generator, since this is run for every S,G on every interval.
 
     Parameters
     ----------
     cli_data: dict
         The dict result from the CLI show command
 
-    Yields
-    ------
-    Tuple where first item is the multicast source (S) ipaddress, then the
-    multicast group (G) ipaddress, then the dataset associated with the S,G flow
-    in CLI dict form.
+    ts: MetricTimestamp
+        The timestamp to assign to each metric
+
+    Returns
+    -------
+    List of McastSGStatus metrics.
     """
-    all_mc_gr_data = cli_data["groups"]
-    for mc_g_ip, mc_g_data in all_mc_gr_data.items():
+    metrics = []
+
+    # local names for the lookups used on each flow
+    append = metrics.append
+    make_metric = mcast_sg.McastSGStatus
+    sg_status = _mcast_sg_status
+    join = ",".join
+
+    for mc_g_ip, mc_g_data in cli_data["groups"].items():
         for mc_s_ip, mc_s_data in mc_g_data["groupSources"].items():
-            if mc_s_ip != "0.0.0.0":
-                yield mc_s_ip, mc_g_ip, mc_s_data
+            if mc_s_ip == "0.0.0.0":
+                continue
+
+            append(
+                make_metric(
+                    ts=ts,
+                    value=sg_status(mc_s_data),
+                    tags={
+                        "S": mc_s_ip,
+                        "G": mc_g_ip,
+                        "flags": mc_s_data["routeFlags"],
+                        "rpf_if_name": mc_s_data["rpfInterface"],
+                        "oif_list": join(mc_s_data["oifList"]),
+                    },
+                )
+            )
+
+    return metrics
@@ -38,13 +38,14 @@ Cisco CLI Flags:
 # -----------------------------------------------------------------------------
 
 from typing import Optional, List
+import asyncio
 import re
 
 # -----------------------------------------------------------------------------
 # Public Imports
 # -----------------------------------------------------------------------------
 
-from ttp import ttp
+from lxml import etree
 from netpaca import Metric, MetricTimestamp
 from netpaca.collectors.executor import CollectorExecutor
 from netpaca.drivers.nxapi import Device
@@ -136,32 +137,40 @@ async def get_mcast_flow_metrics(
     -------
     Option list of Metic items.
     """
-    res = await device.nxapi.exec(["show ip mroute source-tree detail"])
+    # the mroute CLI command does not provide the flags we need to check, so we
+    # need to run the FDMR command as well.  The two commands are independent
+    # so issue them concurrently.
+
+    res_mroute, res_fdmr = await asyncio.gather(
+        device.nxapi.exec(["show ip mroute source-tree detail"]),
+        device.nxapi.exec(
+            [" show forwarding distribution multicast route"], ofmt="text"
+        ),
+    )
 
-    if not res[0].ok:
+    if not res_mroute[0].ok:
         # TODO: add reason for failure from response body to log message
         device.log.error(
             f"{device.name}: failed to collect MROUTE information, skipping."
         )
         return None
 
-    xml_mroute_sgtree = res[0].output
-
-    # the above CLI command does not provide the flags we need to check, so we
-    # need to run another command:
-
-    res = await device.nxapi.exec(
-        [" show forwarding distribution multicast route"], ofmt="text"
-    )
-    if not res[0].ok:
+    if not res_fdmr[0].ok:
         device.log.error(f"{device.name}: failed to collect FDMR")
         return None
 
-    fdmr_data = _parse_show_fdmr(res[0].output)
+    # for large mroute tables the FDMR parsing and the S,G row selection are
+    # CPU bound, so run them in the default executor rather than blocking the
+    # event loop (and the other device collectors) while they run.
+
+    loop = asyncio.get_running_loop()
+    fdmr_data, xml_sg_recs = await asyncio.gather(
+        loop.run_in_executor(None, _parse_show_fdmr, res_fdmr[0].output),
+        loop.run_in_executor(None, _XP_ROWS, res_mroute[0].output),
+    )
 
     metrics = [
-        _make_metric(timestamp, xml_sg_rec, fdmr_data)
-        for xml_sg_rec in xml_mroute_sgtree.xpath(".//ROW_one_route")
+        _make_metric(timestamp, xml_sg_rec, fdmr_data) for xml_sg_rec in xml_sg_recs
     ]
 
     return metrics
@@ -173,62 +182,86 @@ async def get_mcast_flow_metrics(
 #
 # -----------------------------------------------------------------------------
 
-_re_extracto_S_G = re.compile(r"\((?P<S>.+)/\d+, (?P<G>.+)/\d+\)").match
+# XPath expressions are compiled once at import time rather than on each call
+# for each S,G record.
+
+_XP_ROWS = etree.XPath(".//ROW_one_route")
+
+# the OIF names are only used to form the tag values, so return plain strings
+# rather than lxml "smart strings" that each hold a reference to their parent
+# element.
+
+_XP_OIF = etree.XPath("TABLE_oif/ROW_oif/oif-name/text()", smart_strings=False)
+
+# the S,G record child elements used to form the metric; these are collected
+# in a single pass over the record children.
+
+_SG_REC_FIELDS = ("mcast-addrs", "route-iif", "pending", "stats-rate-buf")
 
 
 def _make_metric(ts, xml_sg_rec, fdmr_data) -> Metric:
-    mo = _re_extracto_S_G(xml_sg_rec.findtext("mcast-addrs"))
+    fields = {
+        child.tag: child.text or ""
+        for child in xml_sg_rec.iterchildren(*_SG_REC_FIELDS)
+    }
+
+    # the mcast-addrs value is in the form "(<S>/<len>, <G>/<len>)"
 
-    mcast_s, mcast_g = mo.group("S"), mo.group("G")
+    mcast_s, mcast_g = fields["mcast-addrs"][1:-1].split(", ", 1)
+    mcast_s = mcast_s.rsplit("/", 1)[0]
+    mcast_g = mcast_g.rsplit("/", 1)[0]
     mcast_flags = fdmr_data.get((mcast_s, mcast_g), "")
-    status = _form_sg_status(xml_sg_rec, mcast_flags)
-    oif_list = xml_sg_rec.xpath("TABLE_oif/ROW_oif/oif-name/text()")
+    status = _form_sg_status(fields, mcast_flags)
+
+    # the OIF data is not used for flows that are not available (pending or
+    # dropped), so only extract it for the active/inactive flows.
+
+    if status == 2:
+        oif_count, oif_list = "0", ""
+    else:
+        oifs = _XP_OIF(xml_sg_rec)
+        oif_count, oif_list = str(len(oifs)), ",".join(oifs)
 
     return mcast_sg.McastSGStatus(
         tags={
             "S": mcast_s,
             "G": mcast_g,
-            "rpf_if_name": xml_sg_rec.findtext("route-iif"),
+            "rpf_if_name": fields.get("route-iif", ""),
             "flags": mcast_flags,
-            "oif_count": str(len(oif_list)),
-            "oif_list": ",".join(oif_list),
+            "oif_count": oif_count,
+            "oif_list": oif_list,
         },
         ts=ts,
         value=status,
     )
 
 
-def _form_sg_status(xml_sg_rec, flags) -> int:
+def _form_sg_status(fields, flags) -> int:
 
-    if xml_sg_rec.findtext("pending") == "true":
+    if fields.get("pending") == "true":
         return 2
 
     if "O" in flags or "D" in flags:
         return 2
 
     # if the rate of the counters are 0, then this is an inactive flow
-    return 1 if xml_sg_rec.findtext("stats-rate-buf").startswith("0.000 ") else 0
+    return 1 if fields.get("stats-rate-buf", "").startswith("0.000 ") else 0
 
 
 # -----------------------------------------------------------------------------
-#                     CLI Text Parser (TTP) for FDMR commmand
+#                     CLI Text Parser for FDMR commmand
 # -----------------------------------------------------------------------------
 
-_CLI_FDMR_TEMPLATE = """
-<group name="mc_flows">
-  ({{ source_ipaddr | IP | _start_ }}/32, {{ group_ipaddr | IP }}/32), RPF Interface: {{ ignore }}, flags: {{ flags }}
-</group>
-"""
-
+# matches the FDMR route lines, for example:
+#   (10.1.1.1/32, 239.1.1.1/32), RPF Interface: Ethernet1/1, flags: G
 
-def _parse_show_fdmr(cli_text):
-    parser = ttp(data=cli_text, template=_CLI_FDMR_TEMPLATE, log_level="none")
+_re_fdmr_route = re.compile(
+    r"\((\S+?)/32,\s*(\S+?)/32\),\s*RPF Interface:\s*\S+,\s*flags:[ \t]*(\S*)"
+)
 
-    parser.parse()
-    if not (found := parser.result()[0]):
-        return {}
 
+def _parse_show_fdmr(cli_text):
     return {
-        (rec["source_ipaddr"], rec["group_ipaddr"]): rec["flags"]
-        for rec in found[0]["mc_flows"]
+        (mo.group(1), mo.group(2)): mo.group(3)
+        for mo in _re_fdmr_route.finditer(cli_text)
     }